@@ -4,7 +4,9 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 import contextlib
+import hashlib
 import itertools
+import json
 import os
 import platform
 import re
@@ -18,6 +20,7 @@
 import llnl.util.tty as tty
 from llnl.util.filesystem import path_contains_subdirectory, paths_containing_libs
 
+import spack.caches
 import spack.error
 import spack.schema.environment
 import spack.spec
@@ -95,11 +98,15 @@ def tokenize_flags(flags_values, propagate=False):
 #: components of linker lines to ignore
 _LINKER_LINE_IGNORE = re.compile(r"(collect2 version|^[A-Za-z0-9_]+=|/ldfe )")
 
-#: regex to match linker search paths
-_LINK_DIR_ARG = re.compile(r"^-L(.:)?(?P<dir>[/\\].*)")
-
-#: regex to match linker library path arguments
-_LIBPATH_ARG = re.compile(r"^[-/](LIBPATH|libpath):(?P<dir>.*)")
+#: regex to match linker search paths in a linker line: "-L <dir>", "-Y <dir>",
+#: "-L/<dir>" (possibly with a drive letter) and "-LIBPATH:<dir>" or "/LIBPATH:<dir>"
+_LINK_DIR_ARGS = re.compile(
+    r"(?<!\S)(?:"
+    r"(?:-[LY]\s+)+(?P<next>(?!-[LY](?!\S))\S+)"
+    r"|-L(?:\S:)?(?P<dir>[/\\]\S*)"
+    r"|[-/](?:LIBPATH|libpath):(?P<libpath>\S*)"
+    r")"
+)
 
 
 def _parse_link_paths(string):
@@ -127,26 +134,10 @@ def _parse_link_paths(string):
             continue
         tty.debug(f"implicit link dirs: link line: {line}")
 
-        next_arg = False
-        for arg in line.split():
-            if arg in ("-L", "-Y"):
-                next_arg = True
-                continue
-
-            if next_arg:
-                raw_link_dirs.append(arg)
-                next_arg = False
-                continue
-
-            link_dir_arg = _LINK_DIR_ARG.match(arg)
-            if link_dir_arg:
-                link_dir = link_dir_arg.group("dir")
-                raw_link_dirs.append(link_dir)
-
-            link_dir_arg = _LIBPATH_ARG.match(arg)
-            if link_dir_arg:
-                link_dir = link_dir_arg.group("dir")
-                raw_link_dirs.append(link_dir)
+        raw_link_dirs.extend(
+            m.group("next") or m.group("dir") or m.group("libpath")
+            for m in _LINK_DIR_ARGS.finditer(line)
+        )
 
     implicit_link_dirs = list()
     visited = set()
@@ -202,6 +193,26 @@ class Compiler:
     support for specific compilers, their possible names, arguments,
     and how to identify the particular type of compiler."""
 
+    # Many instances can be alive during concretization. Subclasses should declare
+    # empty __slots__, unless they need to set other attributes on instances.
+    __slots__ = (
+        "spec",
+        "operating_system",
+        "target",
+        "modules",
+        "alias",
+        "environment",
+        "extra_rpaths",
+        "enable_implicit_rpaths",
+        "cc",
+        "cxx",
+        "f77",
+        "fc",
+        "flags",
+        "_real_version",
+        "_compile_c_source_output",
+    )
+
     # Optional prefix regexes for searching for this type of compiler.
     # Prefixes are sometimes used for toolchains
     prefixes: List[str] = []
@@ -291,6 +302,9 @@ def __init__(
         self.extra_rpaths = extra_rpaths or []
         self.enable_implicit_rpaths = enable_implicit_rpaths
 
+        # Paths are shared by many compilers and used as keys in caches. Subclasses of
+        # str (e.g. from YAML) cannot be interned, and are left as they are.
+        paths = [sys.intern(p) if type(p) is str else p for p in paths]
         self.cc = paths[0]
         self.cxx = paths[1]
         self.f77 = None
@@ -369,14 +383,12 @@ def accessible_exe(exe):
                     return False
             return os.path.isfile(exe) and os.access(exe, os.X_OK)
 
+        paths = llnl.util.lang.dedupe(p for p in (self.cc, self.cxx, self.f77, self.fc) if p)
+
         # setup environment before verifying in case we have executable names
         # instead of absolute paths
         with self.compiler_environment():
-            missing = [
-                cmp
-                for cmp in (self.cc, self.cxx, self.f77, self.fc)
-                if cmp and not accessible_exe(cmp)
-            ]
+            missing = [p for p in paths if not accessible_exe(p)]
             if missing:
                 raise CompilerAccessError(self, missing)
 
@@ -446,7 +458,7 @@ def required_libs(self):
     def compiler_verbose_output(self) -> Optional[str]:
         """Verbose output from compiling a dummy C source file. Output is cached."""
         if not hasattr(self, "_compile_c_source_output"):
-            self._compile_c_source_output = self._compile_dummy_c_source()
+            self._compile_c_source_output = COMPILER_CACHE.get(self)
         return self._compile_c_source_output
 
     def _compile_dummy_c_source(self) -> Optional[str]:
@@ -680,9 +692,12 @@ def compiler_environment(self):
 
             yield
         finally:
-            # Restore environment regardless of whether inner code succeeded
-            os.environ.clear()
-            os.environ.update(backup_env)
+            # Restore environment regardless of whether inner code succeeded. Only
+            # variables that changed are reset, to avoid re-exporting all of them.
+            for name in [x for x in os.environ if x not in backup_env]:
+                del os.environ[name]
+            changed = {k: v for k, v in backup_env.items() if os.environ.get(k) != v}
+            os.environ.update(changed)
 
     def to_dict(self):
         flags_dict = {fname: " ".join(fvals) for fname, fvals in self.flags.items()}
@@ -709,6 +724,76 @@ def to_dict(self):
         return result
 
 
+class CompilerCache:
+    """Base class for the cache of compiler verbose output. This default implementation
+    does not cache anything."""
+
+    def get(self, compiler: Compiler) -> Optional[str]:
+        return compiler._compile_dummy_c_source()
+
+
+class FileCompilerCache(CompilerCache):
+    """Persistent cache of the verbose output of compilers, which is used to determine
+    implicit link paths and the default libc. Entries are stored in the file cache as one
+    JSON file per compiler, named after a hash of the compiler configuration."""
+
+    name = "compiler-probe"
+
+    def __init__(self, cache: "spack.caches.FileCacheType") -> None:
+        self.cache = cache
+
+    def get(self, compiler: Compiler) -> Optional[str]:
+        key = os.path.join(self.name, f"{self._key(compiler)}.json")
+
+        # Cache hit
+        if self.cache.init_entry(key):
+            with self.cache.read_transaction(key) as f:
+                output = self._read(f)
+            if output is not None:
+                return output
+
+        # Cache miss. Failures are not stored, since they may be transient (e.g. an
+        # unreachable license server, or a broken module environment)
+        output = compiler._compile_dummy_c_source()
+        if output is None:
+            return None
+
+        with self.cache.write_transaction(key) as (_, new):
+            new.write(json.dumps({"c_compiler_output": output}, separators=(",", ":")))
+        return output
+
+    @staticmethod
+    def _read(f) -> Optional[str]:
+        """Read the output stored in a cache entry, or return None if it is not valid."""
+        try:
+            entry = json.load(f)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("c_compiler_output"), str):
+            return None
+        return entry["c_compiler_output"]
+
+    @staticmethod
+    def _key(compiler: Compiler) -> str:
+        """Hash of everything that can affect the verbose output of a compiler, including
+        the modification time of the executable being probed."""
+        exe = compiler.cc or compiler.cxx
+        try:
+            mtime = os.stat(exe).st_mtime_ns if exe else None
+        except OSError:
+            mtime = None
+        as_bytes = json.dumps([compiler.to_dict(), mtime], sort_keys=True).encode()
+        return hashlib.sha256(as_bytes).hexdigest()
+
+
+def _make_compiler_cache():
+    return FileCompilerCache(spack.caches.MISC_CACHE)
+
+
+#: Cache of the verbose output of compilers
+COMPILER_CACHE: CompilerCache = llnl.util.lang.Singleton(_make_compiler_cache)  # type: ignore
+
+
 class CompilerAccessError(spack.error.SpackError):
     def __init__(self, compiler, paths):
         msg = "Compiler '%s' has executables that are missing" % compiler.spec
@@ -6,7 +6,10 @@
 """This module contains functions related to finding compilers on the
 system and configuring Spack to use multiple compilers.
 """
+import copy
+import hashlib
 import importlib
+import json
 import os
 import re
 import sys
@@ -43,6 +46,9 @@
 #: cache of compilers constructed from config data, keyed by config entry id.
 _compiler_cache: Dict[str, "spack.compiler.Compiler"] = {}
 
+#: cache of compiler config entries constructed from packages.yaml, keyed by content hash.
+_compiler_config_from_packages_cache: Dict[bytes, List[dict]] = {}
+
 _compiler_to_pkg = {
     "clang": "llvm+clang",
     "oneapi": "intel-oneapi-compilers",
@@ -459,6 +465,30 @@ def __eq__(self, other):
 
 
 def compiler_from_dict(items):
+    """Return a compiler constructed from a compilers.yaml entry.
+
+    The entry must contain only data that can be loaded from YAML, i.e. dicts, lists,
+    strings, numbers, booleans and None. Other types raise a TypeError.
+
+    Compilers are cached by the content of the entry. Each call returns a copy of the
+    cached compiler, with its own flags, modules, environment and extra rpaths, so that
+    callers can modify them.
+    """
+    key = json.dumps(items, sort_keys=True)
+    compiler = copy.copy(_compiler_from_dict(key))
+    flags = spack.spec.FlagMap(compiler.spec)
+    for name, values in compiler.flags.items():
+        flags[name] = list(values)
+    compiler.flags = flags
+    compiler.modules = list(compiler.modules)
+    compiler.environment = copy.deepcopy(compiler.environment)
+    compiler.extra_rpaths = list(compiler.extra_rpaths)
+    return compiler
+
+
+@llnl.util.lang.memoized
+def _compiler_from_dict(key: str):
+    items = json.loads(key)
     cspec = spack.spec.parse_with_version_concrete(items["spec"], compiler=True)
     os = items.get("operating_system", None)
     target = items.get("target", None)
@@ -694,22 +724,37 @@ def from_specs(specs: List["spack.spec.Spec"]) -> List[dict]:
 
     @staticmethod
     def from_packages_yaml(packages_yaml) -> List[dict]:
-        compiler_specs = []
-        compiler_package_names = supported_compilers() + list(package_name_to_compiler_name.keys())
-        for name, entry in packages_yaml.items():
-            if name not in compiler_package_names:
-                continue
+        """Return the compiler config entries for the externals in packages.yaml.
+
+        Results are cached by the content of the compiler externals and the host platform,
+        which is used for externals without an architecture. Equal inputs return the same
+        entry objects, so that compilers constructed from them are cached as well: callers
+        must not mutate the entries.
+        """
+        compiler_package_names = set(supported_compilers()) | set(package_name_to_compiler_name)
+        externals = {
+            name: entry["externals"]
+            for name, entry in packages_yaml.items()
+            if name in compiler_package_names and entry.get("externals")
+        }
+        if not externals:
+            return []
 
-            externals_config = entry.get("externals", None)
-            if not externals_config:
-                continue
+        content = json.dumps([externals, str(spack.platforms.host())], sort_keys=True, default=str)
+        key = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        if key not in _compiler_config_from_packages_cache:
+            entries = CompilerConfigFactory._from_externals(externals)
+            _compiler_config_from_packages_cache[key] = entries
+        return list(_compiler_config_from_packages_cache[key])
 
-            current_specs = []
+    @staticmethod
+    def _from_externals(externals: Dict[str, List[dict]]) -> List[dict]:
+        compiler_specs = []
+        for externals_config in externals.values():
             for current_external in externals_config:
                 compiler = CompilerConfigFactory._spec_from_external_config(current_external)
                 if compiler:
-                    current_specs.append(compiler)
-            compiler_specs.extend(current_specs)
+                    compiler_specs.append(compiler)
 
         return CompilerConfigFactory.from_specs(compiler_specs)
 
@@ -13,6 +13,8 @@
 
 
 class Aocc(Compiler):
+    __slots__ = ()
+
     version_argument = "--version"
 
     @property
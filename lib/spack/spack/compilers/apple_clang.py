@@ -12,6 +12,8 @@
 
 
 class AppleClang(spack.compilers.clang.Clang):
+    __slots__ = ()
+
     openmp_flag = "-Xpreprocessor -fopenmp"
 
     @classmethod
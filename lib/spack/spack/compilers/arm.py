@@ -9,6 +9,8 @@
 
 
 class Arm(spack.compiler.Compiler):
+    __slots__ = ()
+
     # Named wrapper links within lib/spack/env
     link_paths = {
         "cc": os.path.join("arm", "armclang"),
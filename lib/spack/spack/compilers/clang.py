@@ -31,6 +31,8 @@
 
 
 class Clang(Compiler):
+    __slots__ = ()
+
     version_argument = "--version"
 
     @property
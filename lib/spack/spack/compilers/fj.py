@@ -9,6 +9,8 @@
 
 
 class Fj(spack.compiler.Compiler):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     link_paths = {
         "cc": os.path.join("fj", "fcc"),
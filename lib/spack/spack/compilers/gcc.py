@@ -14,6 +14,8 @@
 
 
 class Gcc(spack.compiler.Compiler):
+    __slots__ = ()
+
     # MacPorts builds gcc versions with prefixes and -mp-X or -mp-X.Y suffixes.
     # Homebrew and Linuxbrew may build gcc with -X, -X.Y suffixes.
     # Old compatibility versions may contain XY suffixes.
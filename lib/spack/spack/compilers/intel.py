@@ -11,6 +11,8 @@
 
 
 class Intel(Compiler):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     link_paths = {
         "cc": os.path.join("intel", "icc"),
@@ -12,6 +12,8 @@
 
 
 class Nag(spack.compiler.Compiler):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     # Use default wrappers for C and C++, in case provided in compilers.yaml
     link_paths = {
@@ -9,6 +9,8 @@
 
 
 class Nvhpc(Compiler):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     link_paths = {
         "cc": os.path.join("nvhpc", "nvc"),
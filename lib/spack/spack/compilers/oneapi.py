@@ -13,6 +13,8 @@
 
 
 class Oneapi(Compiler):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     link_paths = {
         "cc": os.path.join("oneapi", "icx"),
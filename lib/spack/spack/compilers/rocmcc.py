@@ -11,6 +11,8 @@
 
 
 class Rocmcc(spack.compilers.clang.Clang):
+    __slots__ = ()
+
     @property
     def link_paths(self):
         link_paths = {
@@ -10,6 +10,8 @@
 
 
 class Xl(Compiler):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     link_paths = {
         "cc": os.path.join("xl", "xlc"),
@@ -9,6 +9,8 @@
 
 
 class XlR(spack.compilers.xl.Xl):
+    __slots__ = ()
+
     # Named wrapper links within build_env_path
     link_paths = {
         "cc": os.path.join("xl_r", "xlc_r"),
@@ -296,12 +296,13 @@ def test_compiler_custom_env(config, mock_packages, monkeypatch, working_env):
     else:
         test_path = r"/test/path/element/custom-env/"
 
-    def custom_env(pkg, env):
+    def custom_env(self, pkg, env):
         env.prepend_path("PATH", test_path)
         env.append_flags("ENV_CUSTOM_CC_FLAGS", "--custom-env-flag1")
 
     pkg = spack.spec.Spec("cmake").concretized().package
-    monkeypatch.setattr(pkg.compiler, "setup_custom_environment", custom_env)
+    # Compiler instances have __slots__, so methods must be patched on the class
+    monkeypatch.setattr(type(pkg.compiler), "setup_custom_environment", custom_env)
     spack.build_environment.setup_package(pkg, False)
 
     # Note: trailing slash may be stripped by internal logic
@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 """Test basic behavior of compilers in Spack"""
 import os
-from copy import copy
+from types import MappingProxyType
 
 import pytest
 
@@ -14,6 +14,7 @@
 import spack.compilers
 import spack.config
 import spack.spec
+import spack.util.file_cache
 import spack.util.module_cmd
 from spack.compiler import Compiler
 from spack.util.executable import Executable, ProcessError
@@ -52,34 +53,77 @@ def test_compiler_flags_from_config_are_grouped():
     }
 
     compiler = spack.compilers.compiler_from_dict(compiler_entry)
-    assert any(x == "-foo-flag foo-val" for x in compiler.flags["cflags"])
+    assert "-foo-flag foo-val" in compiler.flags["cflags"]
+
+
+@pytest.mark.parametrize(
+    "flags,expected",
+    [
+        ("", []),
+        ("-O0 -foo-flag foo-val", ["-O0", "-foo-flag foo-val"]),
+        ("  -g\t-Wl,-rpath  /a/b  -x c ", ["-g", "-Wl,-rpath /a/b", "-x c"]),
+        ("value -flag", ["value", "-flag"]),
+    ],
+)
+def test_tokenize_flags(flags, expected):
+    assert spack.compiler.tokenize_flags(flags, True) == [(x, True) for x in expected]
+
+
+def test_compiler_from_dict_is_cached():
+    compiler_entry = {
+        "spec": "gcc@12.2.0",
+        "operating_system": "foo-os",
+        "paths": {"cc": "cc-path", "cxx": "cxx-path", "fc": None, "f77": None},
+        "flags": {"cflags": "-O2"},
+        "modules": None,
+    }
+    first = spack.compilers.compiler_from_dict(compiler_entry)
+    second = spack.compilers.compiler_from_dict(dict(compiler_entry))
+    assert first == second and first is not second
+
+    # Modifying a returned compiler does not affect the cache
+    first.cc = "other-cc-path"
+    first.flags["cflags"].append("-g")
+    first.modules.append("gcc/12.2.0")
+    first.environment["set"] = {"FOO": "bar"}
+    first.extra_rpaths.append("/extra/rpath")
+    for compiler in (second, spack.compilers.compiler_from_dict(compiler_entry)):
+        assert compiler.cc == "cc-path"
+        assert compiler.flags["cflags"] == ["-O2"]
+        assert compiler.modules == [] and compiler.environment == {}
+        assert compiler.extra_rpaths == []
+
+    # A different entry gives a different compiler
+    compiler_entry["flags"] = {"cflags": "-O3"}
+    assert spack.compilers.compiler_from_dict(compiler_entry).flags["cflags"] == ["-O3"]
 
 
 # Test behavior of flags and UnsupportedCompilerFlag.
 
 # Utility function to test most flags.
-default_compiler_entry = {
-    "spec": "apple-clang@2.0.0",
-    "operating_system": "foo-os",
-    "paths": {"cc": "cc-path", "cxx": "cxx-path", "fc": "fc-path", "f77": "f77-path"},
-    "flags": {},
-    "modules": None,
-}
+default_compiler_entry = MappingProxyType(
+    {
+        "spec": "apple-clang@2.0.0",
+        "operating_system": "foo-os",
+        "paths": MappingProxyType(
+            {"cc": "cc-path", "cxx": "cxx-path", "fc": "fc-path", "f77": "f77-path"}
+        ),
+        "flags": MappingProxyType({}),
+        "modules": None,
+    }
+)
 
 
 # Fake up a mock compiler where everything is defaulted.
 class MockCompiler(Compiler):
+    _DEFAULT_PATHS = tuple(default_compiler_entry["paths"][x] for x in ("cc", "cxx", "fc", "f77"))
+
     def __init__(self):
         super().__init__(
             cspec="badcompiler@1.0.0",
             operating_system=default_compiler_entry["operating_system"],
             target=None,
-            paths=[
-                default_compiler_entry["paths"]["cc"],
-                default_compiler_entry["paths"]["cxx"],
-                default_compiler_entry["paths"]["fc"],
-                default_compiler_entry["paths"]["f77"],
-            ],
+            paths=list(self._DEFAULT_PATHS),
             environment={},
         )
 
@@ -104,7 +148,7 @@ def verbose_flag(self):
 def test_implicit_rpaths(dirs_with_libfiles):
     lib_to_dirs, all_dirs = dirs_with_libfiles
     compiler = MockCompiler()
-    compiler._compile_c_source_output = "ld " + " ".join(f"-L{d}" for d in all_dirs)
+    compiler._compile_c_source_output = " ".join(("ld", *(f"-L{d}" for d in all_dirs)))
     retrieved_rpaths = compiler.implicit_rpaths()
     assert set(retrieved_rpaths) == set(lib_to_dirs["libstdc++"] + lib_to_dirs["libgfortran"])
 
@@ -112,13 +156,18 @@ def test_implicit_rpaths(dirs_with_libfiles):
 without_flag_output = "ld -L/path/to/first/lib -L/path/to/second/lib64"
 with_flag_output = "ld -L/path/to/first/with/flag/lib -L/path/to/second/lib64"
 
+#: output of the mock compiler, depending on whether it is called with "--correct-flag"
+_RESPONSES = {True: with_flag_output, False: without_flag_output}
+
 
 def call_compiler(exe, *args, **kwargs):
     # This method can replace Executable.__call__ to emulate a compiler that
     # changes libraries depending on a flag.
-    if "--correct-flag" in exe.exe:
-        return with_flag_output
-    return without_flag_output
+    return _RESPONSES["--correct-flag" in exe.exe]
+
+
+#: compiler paths to unset, so that only the given one is used to compile
+_NULLIFY = {"cxx": ("cc", "fc", "f77"), "cc": ("cxx", "fc", "f77")}
 
 
 @pytest.mark.not_on_windows("Not supported on Windows (yet)")
@@ -138,16 +187,8 @@ def test_compile_dummy_c_source_adds_flags(monkeypatch, exe, flagname):
     compiler = MockCompiler()
     monkeypatch.setattr(Executable, "__call__", call_compiler)
 
-    if exe == "cxx":
-        compiler.cc = None
-        compiler.fc = None
-        compiler.f77 = None
-    elif exe == "cc":
-        compiler.cxx = None
-        compiler.fc = None
-        compiler.f77 = None
-    else:
-        assert False
+    for attr in _NULLIFY[exe]:
+        setattr(compiler, attr, None)
 
     # Test without flags
     assert compiler._compile_dummy_c_source() == without_flag_output
@@ -173,20 +214,17 @@ def test_compile_dummy_c_source_no_verbose_flag():
     assert compiler._compile_dummy_c_source() is None
 
 
+def call_gcc(exe, *args, **kwargs):
+    # This method can replace Executable.__call__ to emulate a compiler that
+    # produces output only if its module and environment are loaded.
+    if os.environ.get("ENV_SET") == "1" and os.environ.get("MODULE_LOADED") == "1":
+        return without_flag_output
+    return ""
+
+
 @pytest.mark.not_on_windows("Not supported on Windows (yet)")
 @pytest.mark.enable_compiler_execution
-def test_compile_dummy_c_source_load_env(working_env, monkeypatch, tmpdir):
-    gcc = str(tmpdir.join("gcc"))
-    with open(gcc, "w") as f:
-        f.write(
-            f"""#!/bin/sh
-if [ "$ENV_SET" = "1" ] && [ "$MODULE_LOADED" = "1" ]; then
-  printf '{without_flag_output}'
-fi
-"""
-        )
-    fs.set_executable(gcc)
-
+def test_compile_dummy_c_source_load_env(working_env, monkeypatch):
     # Set module load to turn compiler on
     def module(*args):
         if args[0] == "show":
@@ -195,23 +233,71 @@ def module(*args):
             os.environ["MODULE_LOADED"] = "1"
 
     monkeypatch.setattr(spack.util.module_cmd, "module", module)
+    monkeypatch.setattr(Executable, "__call__", call_gcc)
 
     compiler = MockCompiler()
-    compiler.cc = gcc
+    compiler.cc = "gcc"
     compiler.environment = {"set": {"ENV_SET": "1"}}
     compiler.modules = ["turn_on"]
 
     assert compiler._compile_dummy_c_source() == without_flag_output
 
 
+@pytest.mark.enable_compiler_execution
+def test_compiler_output_file_cache(monkeypatch, tmpdir):
+    """Tests that the verbose output of a compiler is cached on disk, and recomputed
+    when the compiler configuration changes.
+    """
+    calls = []
+
+    def _compile_dummy_c_source(self):
+        calls.append(self.flags.get("cflags"))
+        if self.flags.get("cflags") == ["--fail"]:
+            return None
+        return with_flag_output if self.flags.get("cflags") else without_flag_output
+
+    monkeypatch.setattr(MockCompiler, "_compile_dummy_c_source", _compile_dummy_c_source)
+    cache = spack.compiler.FileCompilerCache(spack.util.file_cache.FileCache(str(tmpdir)))
+
+    # The second call is served from the cache, even with a different instance
+    assert cache.get(MockCompiler()) == without_flag_output
+    assert cache.get(MockCompiler()) == without_flag_output
+    assert len(calls) == 1
+
+    # A change in the flags invalidates the entry
+    compiler = MockCompiler()
+    compiler.flags = {"cflags": ["--correct-flag"]}
+    assert cache.get(compiler) == with_flag_output
+    assert len(calls) == 2
+
+    # Corrupted entries are recomputed
+    for entry in tmpdir.join(cache.name).listdir("*.json"):
+        entry.write("{")
+    assert cache.get(MockCompiler()) == without_flag_output
+    assert len(calls) == 3
+
+    # Failures are not stored, and are retried on the next call
+    compiler = MockCompiler()
+    compiler.flags = {"cflags": ["--fail"]}
+    entries = sorted(tmpdir.join(cache.name).listdir("*.json"))
+    assert cache.get(compiler) is None
+    assert cache.get(compiler) is None
+    assert len(calls) == 5
+    assert sorted(tmpdir.join(cache.name).listdir("*.json")) == entries
+
+
 # Get the desired flag from the specified compiler spec.
 def flag_value(flag, spec):
     compiler = None
     if spec is None:
         compiler = MockCompiler()
     else:
-        compiler_entry = copy(default_compiler_entry)
-        compiler_entry["spec"] = spec
+        compiler_entry = {
+            **default_compiler_entry,
+            "spec": spec,
+            "paths": dict(default_compiler_entry["paths"]),
+            "flags": dict(default_compiler_entry["flags"]),
+        }
         compiler = spack.compilers.compiler_from_dict(compiler_entry)
 
     return getattr(compiler, flag)
@@ -879,15 +965,49 @@ def test_detection_requires_c_compiler(compilers_extra_attributes, expected_leng
     assert len(result) == expected_length
 
 
-def test_compiler_environment(working_env):
+def test_compiler_config_from_packages_yaml_is_cached():
+    """Tests that equal packages.yaml content gives the same compiler config entries."""
+    packages_yaml = {
+        "llvm": {
+            "externals": [
+                {
+                    "spec": "clang@12.0.0",
+                    "prefix": "/usr",
+                    "extra_attributes": {"compilers": {"c": "/usr/bin/clang-12"}},
+                }
+            ]
+        }
+    }
+    first = spack.compilers.CompilerConfigFactory.from_packages_yaml(packages_yaml)
+    second = spack.compilers.CompilerConfigFactory.from_packages_yaml(dict(packages_yaml))
+    assert first == second and first is not second
+    # Entries are shared on purpose, so that compilers built from them are cached too
+    assert all(x is y for x, y in zip(first, second))
+
+    # Packages that are not compilers do not affect the result
+    packages_yaml["zlib"] = {"externals": [{"spec": "zlib@1.3", "prefix": "/usr"}]}
+    assert spack.compilers.CompilerConfigFactory.from_packages_yaml(packages_yaml) == first
+
+    packages_yaml["llvm"]["externals"][0]["extra_attributes"]["compilers"]["c"] = "/usr/bin/cc"
+    third = spack.compilers.CompilerConfigFactory.from_packages_yaml(packages_yaml)
+    assert third[0]["compiler"]["paths"]["cc"] == "/usr/bin/cc"
+
+
+def test_compiler_environment(monkeypatch):
     """Test whether environment modifications from compilers are applied in compiler_environment"""
-    os.environ.pop("TEST", None)
+    monkeypatch.delenv("TEST", raising=False)
+    monkeypatch.setenv("TEST_UNSET", "yes")
     compiler = Compiler(
         "gcc@=13.2.0",
         operating_system="ubuntu20.04",
         target="x86_64",
         paths=["/test/bin/gcc", "/test/bin/g++"],
-        environment={"set": {"TEST": "yes"}},
+        environment={"set": {"TEST": "yes"}, "unset": ["TEST_UNSET"]},
     )
     with compiler.compiler_environment():
         assert os.environ["TEST"] == "yes"
+        assert "TEST_UNSET" not in os.environ
+
+    # The environment is restored on exit
+    assert "TEST" not in os.environ
+    assert os.environ["TEST_UNSET"] == "yes"
@@ -365,8 +365,12 @@ def reset_compiler_cache():
     with the new configuration. Since tests can make almost unlimited changes
     to their setup, default to not use the compiler cache across tests."""
     spack.compilers._compiler_cache = {}
+    spack.compilers._compiler_config_from_packages_cache = {}
+    spack.compilers._compiler_from_dict.cache.clear()
     yield
     spack.compilers._compiler_cache = {}
+    spack.compilers._compiler_config_from_packages_cache = {}
+    spack.compilers._compiler_from_dict.cache.clear()
 
 
 def onerror(func, path, error_info):
@@ -978,6 +982,12 @@ def disable_compiler_execution(monkeypatch, request):
         monkeypatch.setattr(spack.compiler.Compiler, "_compile_dummy_c_source", _return_none)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def disable_compiler_output_cache(monkeypatch):
+    """Do not persist the verbose output of compilers across tests."""
+    monkeypatch.setattr(spack.compiler, "COMPILER_CACHE", spack.compiler.CompilerCache())
+
+
 @pytest.fixture(scope="function")
 def install_mockery(temporary_store: spack.store.Store, mutable_config, mock_packages):
     """Hooks a fake install directory, DB, and stage directory into Spack."""
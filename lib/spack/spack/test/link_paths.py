@@ -9,7 +9,7 @@
 import pytest
 
 import spack.paths
-from spack.compiler import _parse_non_system_link_dirs
+from spack.compiler import _parse_link_paths, _parse_non_system_link_dirs
 
 drive = ""
 if sys.platform == "win32":
@@ -213,3 +213,10 @@ def test_obscure_parsing_rules():
         paths.remove(os.path.join(root, "second", "path"))
 
     check_link_paths("obscure-parsing-rules.txt", paths)
+
+
+def test_separate_link_dir_args():
+    # Repeated -L or -Y apply to the next argument, and a trailing one is ignored
+    output = "ld -L -Y /first/path -L/second/path -L /third/path -lfoo -L"
+    expected = ["/first/path", "/second/path", "/third/path"]
+    assert _parse_link_paths(output) == [os.path.abspath(x) for x in expected]